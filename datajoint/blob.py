@@ -4,6 +4,7 @@ compatibility with Matlab-based serialization implemented by mYm.
 """
 
 import zlib
+import struct
 from itertools import repeat
 import collections
 from decimal import Decimal
@@ -38,6 +39,11 @@ rev_class_id = {dtype: i for i, dtype in enumerate(mxClassID.values())}
 dtype_list = list(mxClassID.values())
 type_names = list(mxClassID)
 
+# precompiled readers for single values to avoid allocating a numpy array for each scalar
+scalar_structs = {dtype: struct.Struct('=' + fmt) for dtype, fmt in (
+    ('bool', '?'), ('uint8', 'B'), ('uint16', 'H'), ('uint32', 'I'), ('uint64', 'Q'),
+    ('int32', 'i'), ('int64', 'q'), ('float64', 'd'))}
+
 compression = {
     b'ZL123\0': zlib.decompress
 }
@@ -64,6 +70,31 @@ class MatStruct(np.recarray):
 
 
 class Blob:
+    # dispatch table from data structure codes to the names of their reader methods
+    _readers = {
+        # MATLAB-compatible, inherited from original mYm
+        "A": 'read_array',         # matlab-compatible numeric arrays and scalars with ndim==0
+        "P": 'read_sparse_array',  # matlab sparse array -- not supported yet
+        "S": 'read_struct',        # matlab struct array
+        "C": 'read_cell_array',    # matlab cell array
+        # basic data types
+        "\xFF": 'read_none',       # None
+        "\x01": 'read_tuple',      # a Sequence (e.g. tuple)
+        "\x02": 'read_list',       # a MutableSequence (e.g. list)
+        "\x03": 'read_set',        # a Set
+        "\x04": 'read_dict',       # a Mapping (e.g. dict)
+        "\x05": 'read_string',     # a UTF8-encoded string
+        "\x06": 'read_bytes',      # a ByteString
+        "\x0a": 'read_int',        # unbounded scalar int
+        "\x0b": 'read_bool',       # scalar boolean
+        "\x0c": 'read_complex',    # scalar 128-bit complex number
+        "\x0d": 'read_float',      # scalar 64-bit float
+        "F": 'read_recarray',      # numpy array with fields, including recarrays
+        "d": 'read_decimal',       # a decimal
+        "t": 'read_datetime',      # date, time, or datetime
+        "u": 'read_uuid',          # UUID
+    }
+
     def __init__(self, squeeze=False):
         self._squeeze = squeeze
         self._blob = None
@@ -91,13 +122,13 @@ class Blob:
         self._blob = blob
         try:
             # decompress
-            prefix = next(p for p in compression if self._blob[self._pos:].startswith(p))
+            prefix = next(p for p in compression if self._blob.startswith(p, self._pos))
         except StopIteration:
             pass  # assume uncompressed but could be unrecognized compression
         else:
             self._pos += len(prefix)
             blob_size = self.read_value('uint64')
-            blob = compression[prefix](self._blob[self._pos:])
+            blob = compression[prefix](memoryview(self._blob)[self._pos:])
             assert len(blob) == blob_size
             self._blob = blob
             self._pos = 0
@@ -109,29 +140,7 @@ class Blob:
         start = self._pos
         data_structure_code = chr(self.read_value('uint8'))
         try:
-            call = {
-                # MATLAB-compatible, inherited from original mYm
-                "A": self.read_array,         # matlab-compatible numeric arrays and scalars with ndim==0
-                "P": self.read_sparse_array,  # matlab sparse array -- not supported yet
-                "S": self.read_struct,        # matlab struct array
-                "C": self.read_cell_array,    # matlab cell array
-                # basic data types
-                "\xFF": self.read_none,    # None
-                "\x01": self.read_tuple,     # a Sequence (e.g. tuple)
-                "\x02": self.read_list,      # a MutableSequence (e.g. list)
-                "\x03": self.read_set,       # a Set
-                "\x04": self.read_dict,      # a Mapping (e.g. dict)
-                "\x05": self.read_string,    # a UTF8-encoded string
-                "\x06": self.read_bytes,     # a ByteString
-                "\x0a": self.read_int,       # unbounded scalar int
-                "\x0b": self.read_bool,      # scalar boolean
-                "\x0c": self.read_complex,   # scalar 128-bit complex number
-                "\x0d": self.read_float,     # scalar 64-bit float
-                "F": self.read_recarray,     # numpy array with fields, including recarrays
-                "d": self.read_decimal,      # a decimal
-                "t": self.read_datetime,     # date, time, or datetime
-                "u": self.read_uuid,         # UUID
-            }[data_structure_code]
+            call = getattr(self, self._readers[data_structure_code])
         except KeyError:
             raise DataJointError('Unknown data structure code "%s". Upgrade datajoint.' % data_structure_code)
         v = call()
@@ -302,7 +311,10 @@ class Blob:
         return b"d" + len_u64(s) + s.encode()
 
     def read_string(self):
-        return self.read_binary(self.read_value()).decode()
+        size = int(self.read_value())
+        self._pos += size
+        # decode straight from the buffer without first copying the slice into a bytes object
+        return str(memoryview(self._blob)[self._pos - size:self._pos], 'utf-8')
 
     @staticmethod
     def pack_string(s):
@@ -430,6 +442,11 @@ class Blob:
         return data
 
     def read_value(self, dtype='uint64', count=1):
+        if count == 1 and isinstance(dtype, str) and dtype in scalar_structs:
+            reader = scalar_structs[dtype]
+            value, = reader.unpack_from(self._blob, self._pos)
+            self._pos += reader.size
+            return value
         data = np.frombuffer(self._blob, dtype=dtype, count=count, offset=self._pos)
         self._pos += data.dtype.itemsize * data.size
         return data[0] if count == 1 else data
@@ -2,6 +2,7 @@
 
 import inspect
 import collections
+import functools
 import re
 import uuid
 import datetime
@@ -15,6 +16,8 @@ class PromiscuousOperand:
     """
     A container for an operand to ignore join compatibility
     """
+    __slots__ = ('operand',)
+
     def __init__(self, operand):
         self.operand = operand
 
@@ -30,6 +33,8 @@ class AndList(list):
     is equivalent to
     expr2 = expr & cond1 & cond2 & cond3
     """
+    __slots__ = ()  # a copy is made for every restriction of a query expression
+
     def append(self, restriction):
         if isinstance(restriction, AndList):
             # extend to reduce nesting
@@ -40,6 +45,8 @@ class AndList(list):
 
 class Not:
     """ invert restriction """
+    __slots__ = ('restriction',)
+
     def __init__(self, restriction):
         self.restriction = restriction
 
@@ -54,13 +61,12 @@ def assert_join_compatibility(expr1, expr2):
     :param expr1: A QueryExpression object
     :param expr2: A QueryExpression object
     """
-    from .expression import QueryExpression, U
-
     for rel in (expr1, expr2):
-        if not isinstance(rel, (U, QueryExpression)):
+        if not isinstance(rel, (expression.U, expression.QueryExpression)):
             raise DataJointError(
                 'Object %r is not a QueryExpression and cannot be joined.' % rel)
-    if not isinstance(expr1, U) and not isinstance(expr2, U):  # dj.U is always compatible
+    # dj.U is always compatible
+    if not isinstance(expr1, expression.U) and not isinstance(expr2, expression.U):
         try:
             raise DataJointError(
                 "Cannot join query expressions on dependent attribute `%s`" % next(
@@ -80,8 +86,6 @@ def make_condition(query_expression, condition, columns):
         condition.
     :return: an SQL condition string or a boolean value.
     """
-    from .expression import QueryExpression, Aggregation, U
-
     def prep_value(k, v):
         """prepare value v for inclusion as a string in an SQL condition"""
         if query_expression.heading[k].uuid:
@@ -122,7 +126,7 @@ def make_condition(query_expression, condition, columns):
         return template % ('(' + ') AND ('.join(items) + ')')
 
     # restriction by dj.U evaluates to True
-    if isinstance(condition, U):
+    if isinstance(condition, expression.U):
         return not negate
 
     # restrict by boolean
@@ -151,7 +155,7 @@ def make_condition(query_expression, condition, columns):
             '`%s`=%s' % (k, prep_value(k, condition[k])) for k in common_attributes) + ')')
 
     # restrict by a QueryExpression subclass -- trigger instantiation and move on
-    if inspect.isclass(condition) and issubclass(condition, QueryExpression):
+    if inspect.isclass(condition) and issubclass(condition, expression.QueryExpression):
         condition = condition()
 
     # restrict by another expression (aka semijoin and antijoin)
@@ -160,13 +164,13 @@ def make_condition(query_expression, condition, columns):
         condition = condition.operand
         check_compatibility = False
 
-    if isinstance(condition, QueryExpression):
+    if isinstance(condition, expression.QueryExpression):
         if check_compatibility:
             assert_join_compatibility(query_expression, condition)
-        common_attributes = [q for q in condition.heading.names
-                             if q in query_expression.heading.names]
+        names = set(query_expression.heading.names)
+        common_attributes = [q for q in condition.heading.names if q in names]
         columns.update(common_attributes)
-        if isinstance(condition, Aggregation):
+        if isinstance(condition, expression.Aggregation):
             condition = condition.make_subquery()
         return (
             # without common attributes, any non-empty set matches everything
@@ -192,13 +196,14 @@ def make_condition(query_expression, condition, columns):
         return template % ('(%s)' % ' OR '.join(or_list)) if or_list else negate
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_column_names(sql_expression):
     """
     extract all presumed column names from an sql expression such as the WHERE clause,
-    for example.
+    for example. Results are cached since the same expressions are parsed repeatedly.
 
     :param sql_expression: a string containing an SQL expression
-    :return: set of extracted column names
+    :return: frozenset of extracted column names
     This may be MySQL-specific for now.
     """
     assert isinstance(sql_expression, str)
@@ -222,4 +227,9 @@ def extract_column_names(sql_expression):
                                       "not", "interval", "second", "minute", "hour", "day",
                                       "month", "week", "year"
                                       })
-    return result
+    return frozenset(result)
+
+
+# imported last to resolve the circular dependency with expression.py without
+# importing inside the functions above, which run for every restriction
+from . import expression  # noqa: E402
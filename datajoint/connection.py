@@ -293,7 +293,7 @@ class Connection:
 
         if reconnect is None:
             reconnect = config['database.reconnect']
-        logger.debug("Executing SQL:" + query[:query_log_max_length])
+        logger.debug("Executing SQL:%s", query[:query_log_max_length])
         cursor_class = client.cursors.DictCursor if as_dict else client.cursors.Cursor
         cursor = self._conn.cursor(cursor=cursor_class)
         try:
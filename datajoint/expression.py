@@ -1,7 +1,5 @@
-from itertools import count
 import logging
 import inspect
-import copy
 import re
 from .settings import config
 from .errors import DataJointError
@@ -12,6 +10,12 @@ from .condition import AndList, Not, \
 
 logger = logging.getLogger(__name__)
 
+# patterns for named attributes in proj:
+# new attributes in parentheses are included again with the new name without removing original
+duplication_pattern = re.compile(r'\s*\(\s*(?P<name>[a-z][a-z_0-9]*)\s*\)\s*$')
+# attributes without parentheses renamed
+rename_pattern = re.compile(r'\s*(?P<name>[a-z][a-z_0-9]*)\s*$')
+
 
 class QueryExpression:
     """
@@ -47,16 +51,17 @@ class QueryExpression:
     # If the query will be using distinct
     _distinct = False
 
+    _cached_sql = None  # memoized (heading, sql) of make_sql() with default fields; reset on copy
+    _iter_batch_size = 1024  # number of records fetched per query when iterating
+
     @property
     def connection(self):
         """ a dj.Connection object """
-        assert self._connection is not None
         return self._connection
 
     @property
     def support(self):
         """ A list of table names or subqueries to from the FROM clause """
-        assert self._support is not None
         return self._support
 
     @property
@@ -87,17 +92,20 @@ class QueryExpression:
     def primary_key(self):
         return self.heading.primary_key
 
-    _subquery_alias_count = count()    # count for alias names used in the FROM clause
+    _cached_from_clause = None  # memoized result of from_clause()
 
     def from_clause(self):
-        support = ('(' + src.make_sql() + ') as `$%x`' % next(
-            self._subquery_alias_count) if isinstance(src, QueryExpression)
-            else src for src in self.support)
+        if self._cached_from_clause is not None:
+            return self._cached_from_clause
+        # subqueries are aliased by their position so that the same expression always yields the same SQL
+        support = ('(' + src.make_sql() + ') as `$%x`' % i if isinstance(src, QueryExpression)
+                   else src for i, src in enumerate(self.support))
         clause = next(support)
         for s, left in zip(support, self._left):
             clause += ' NATURAL{left} JOIN {clause}'.format(
                 left=" LEFT" if left else "",
                 clause=s)
+        self._cached_from_clause = clause
         return clause
 
     def where_clause(self):
@@ -109,10 +117,28 @@ class QueryExpression:
         Make the SQL SELECT statement.
         :param fields: used to explicitly set the select attributes
         """
-        return 'SELECT {distinct}{fields} FROM {from_}{where}'.format(
+        if fields is None and self._cached_sql is not None and self._cached_sql[0] is self.heading:
+            return self._cached_sql[1]  # reuse only while the heading has not been replaced, e.g. by alter
+        sql = 'SELECT {distinct}{fields} FROM {from_}{where}'.format(
             distinct="DISTINCT " if self._distinct else "",
             fields=self.heading.as_sql(fields or self.heading.names),
             from_=self.from_clause(), where=self.where_clause())
+        if fields is None:
+            self._cached_sql = self.heading, sql
+        return sql
+
+    def _copy(self):
+        """
+        :return: a shallow copy of self to be modified by an operator.
+        The memoized SQL is not carried over and the restriction attributes are not shared.
+        The memoized FROM clause is kept since operators that copy do not change the support.
+        """
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result._cached_sql = None
+        if self._restriction_attributes is not None:
+            result._restriction_attributes = set(self._restriction_attributes)
+        return result
 
     # --------- query operators -----------
     def make_subquery(self):
@@ -168,16 +194,24 @@ class QueryExpression:
         :param restriction: a sequence or an array (treated as OR list), another QueryExpression, an SQL condition
         string, or an AndList.
         """
+        # fast path for restrictions that trivially have no effect
+        # rel & True, rel & AndList()
+        trivially_true = restriction is True or (isinstance(restriction, AndList) and not restriction)
+        # rel - False, rel - [] (but not rel - AndList(), which is empty)
+        inverse = restriction.restriction if isinstance(restriction, Not) else None
+        trivially_negated = inverse is False or (
+            isinstance(inverse, (list, tuple)) and not isinstance(inverse, AndList) and not inverse)
+        if trivially_true or trivially_negated:
+            return self
         attributes = set()
         new_condition = make_condition(self, restriction, attributes)
         if new_condition is True:
             return self  # restriction has no effect, return the same object
         # check that all attributes in condition are present in the query
-        try:
-            raise DataJointError("Attribute `%s` is not found in query." % next(
-                attr for attr in attributes if attr not in self.heading.names))
-        except StopIteration:
-            pass  # all ok
+        names = set(self.heading.names)
+        for attr in attributes:
+            if attr not in names:
+                raise DataJointError("Attribute `%s` is not found in query." % attr)
         # If the new condition uses any new attributes, a subquery is required.
         # However, Aggregation's HAVING statement works fine with aliased attributes.
         need_subquery = isinstance(self, Union) or (
@@ -185,7 +219,7 @@ class QueryExpression:
         if need_subquery:
             result = self.make_subquery()
         else:
-            result = copy.copy(self)
+            result = self._copy()
             result._restriction = AndList(self.restriction)  # copy to preserve the original
         result.restriction.append(new_condition)
         result.restriction_attributes.update(attributes)
@@ -193,6 +227,8 @@ class QueryExpression:
 
     def restrict_in_place(self, restriction):
         self.__dict__.update(self.restrict(restriction).__dict__)
+        self._cached_sql = None
+        self._cached_from_clause = None
 
     def __and__(self, restriction):
         """
@@ -261,18 +297,18 @@ class QueryExpression:
             raise DataJointError("The argument of join must be a QueryExpression")
         if semantic_check:
             assert_join_compatibility(self, other)
-        join_attributes = set(n for n in self.heading.names if n in other.heading.names)
+        join_attributes = set(self.heading.names).intersection(other.heading.names)
         # needs subquery if FROM class has common attributes with the other's FROM clause
         need_subquery1 = need_subquery2 = bool(
             (set(self.original_heading.names) & set(other.original_heading.names))
             - join_attributes)
         # need subquery if any of the join attributes are derived
         need_subquery1 = (need_subquery1 or isinstance(self, Aggregation) or
-                          any(n in self.heading.new_attributes for n in join_attributes)
+                          not join_attributes.isdisjoint(self.heading.new_attributes)
                           or isinstance(self, Union))
         need_subquery2 = (need_subquery2 or isinstance(other, Aggregation) or
-                          any(n in other.heading.new_attributes for n in join_attributes)
-                          or isinstance(self, Union))
+                          not join_attributes.isdisjoint(other.heading.new_attributes)
+                          or isinstance(other, Union))
         if need_subquery1:
             self = self.make_subquery()
         if need_subquery2:
@@ -312,82 +348,70 @@ class QueryExpression:
         from other attributes available before the projection.
         Each attribute name can only be used once.
         """
-        # new attributes in parentheses are included again with the new name without removing original
-        duplication_pattern = re.compile(r'\s*\(\s*(?P<name>[a-z][a-z_0-9]*)\s*\)\s*$')
-        # attributes without parentheses renamed
-        rename_pattern = re.compile(r'\s*(?P<name>[a-z][a-z_0-9]*)\s*$')
-        replicate_map = {k: m.group('name')
-                         for k, m in ((k, duplication_pattern.match(v)) for k, v in named_attributes.items()) if m}
-        rename_map = {k: m.group('name')
-                      for k, m in ((k, rename_pattern.match(v)) for k, v in named_attributes.items()) if m}
-        compute_map = {k: v for k, v in named_attributes.items()
-                       if not duplication_pattern.match(v) and not rename_pattern.match(v)}
+        # classify the named attributes in one pass: duplicated, renamed, or computed
+        replicate_map, rename_map, compute_map = {}, {}, {}
+        for k, v in named_attributes.items():
+            m = duplication_pattern.match(v)
+            if m:
+                replicate_map[k] = m.group('name')
+                continue
+            m = rename_pattern.match(v)
+            if m:
+                rename_map[k] = m.group('name')
+            else:
+                compute_map[k] = v
+        renamed = set(rename_map.values())
         attributes = set(attributes)
         # include primary key
-        attributes.update((k for k in self.primary_key if k not in rename_map.values()))
+        attributes.update((k for k in self.primary_key if k not in renamed))
         # include all secondary attributes with Ellipsis
         if Ellipsis in attributes:
             attributes.discard(Ellipsis)
             attributes.update((a for a in self.heading.secondary_attributes
-                               if a not in attributes and a not in rename_map.values()))
-        try:
-            raise DataJointError("%s is not a valid data type for an attribute in .proj" % next(
-                a for a in attributes if not isinstance(a, str)))
-        except StopIteration:
-            pass  # normal case
+                               if a not in attributes and a not in renamed))
+        for a in attributes:
+            if not isinstance(a, str):
+                raise DataJointError("%s is not a valid data type for an attribute in .proj" % a)
         # remove excluded attributes, specified as `-attr'
         excluded = set(a for a in attributes if a.strip().startswith('-'))
         attributes.difference_update(excluded)
         excluded = set(a.lstrip('-').strip() for a in excluded)
         attributes.difference_update(excluded)
-        try:
-            raise DataJointError("Cannot exclude primary key attribute %s", next(
-                a for a in excluded if a in self.primary_key))
-        except StopIteration:
-            pass  # all ok
+        primary_key = set(self.primary_key)
+        for a in excluded:
+            if a in primary_key:
+                raise DataJointError("Cannot exclude primary key attribute %s" % a)
         # check that all attributes exist in heading
-        try:
-            raise DataJointError(
-                'Attribute `%s` not found.' % next(a for a in attributes if a not in self.heading.names))
-        except StopIteration:
-            pass  # all ok
+        names = set(self.heading.names)
+        for a in attributes:
+            if a not in names:
+                raise DataJointError('Attribute `%s` not found.' % a)
 
         # check that all mentioned names are present in heading
-        mentions = attributes.union(replicate_map.values()).union(rename_map.values())
-        try:
-            raise DataJointError("Attribute '%s' not found." % next(a for a in mentions if not self.heading.names))
-        except StopIteration:
-            pass  # all ok
+        for a in renamed.union(replicate_map.values()):
+            if a not in names:
+                raise DataJointError("Attribute '%s' not found." % a)
 
         # check that newly created attributes do not clash with any other selected attributes
-        try:
-            raise DataJointError("Attribute `%s` already exists" % next(
-                a for a in rename_map if a in attributes.union(compute_map).union(replicate_map)))
-        except StopIteration:
-            pass  # all ok
-        try:
-            raise DataJointError("Attribute `%s` already exists" % next(
-                a for a in compute_map if a in attributes.union(rename_map).union(replicate_map)))
-        except StopIteration:
-            pass  # all ok
-        try:
-            raise DataJointError("Attribute `%s` already exists" % next(
-                a for a in replicate_map if a in attributes.union(rename_map).union(compute_map)))
-        except StopIteration:
-            pass  # all ok
+        for new_map, other_maps in ((rename_map, (compute_map, replicate_map)),
+                                    (compute_map, (rename_map, replicate_map)),
+                                    (replicate_map, (rename_map, compute_map))):
+            taken = attributes.union(*other_maps)
+            for a in new_map:
+                if a in taken:
+                    raise DataJointError("Attribute `%s` already exists" % a)
 
         # need a subquery if the projection remaps any remapped attributes
         used = set(q for v in compute_map.values() for q in extract_column_names(v))
-        used.update(rename_map.values())
+        used.update(renamed)
         used.update(replicate_map.values())
-        used.intersection_update(self.heading.names)
-        need_subquery = isinstance(self, Union) or any(
-            self.heading[name].attribute_expression is not None for name in used)
+        new_attributes = self.heading.new_attributes  # attributes with expressions
+        need_subquery = isinstance(self, Union) or not used.isdisjoint(new_attributes)
         if not need_subquery and self.restriction:
             # need a subquery if the restriction applies to attributes that have been renamed
-            need_subquery = any(name in self.restriction_attributes for name in self.heading.new_attributes)
+            need_subquery = not self.restriction_attributes.isdisjoint(new_attributes)
 
-        result = self.make_subquery() if need_subquery else copy.copy(self)
+        result = self.make_subquery() if need_subquery else self._copy()
         result._original_heading = result.original_heading
         result._heading = result.heading.select(
             attributes, rename_map=dict(**rename_map, **replicate_map), compute_map=compute_map)
@@ -443,13 +467,10 @@ class QueryExpression:
 
     def __len__(self):
         """:return: number of elements in the result set e.g. ``len(q1)``."""
+        select = ('count(*)' if any(self._left) else
+                  f'count(DISTINCT {self.heading.as_sql(self.primary_key, include_aliases=False)})')
         return self.connection.query(
-            'SELECT {select_} FROM {from_}{where}'.format(
-                select_=('count(*)' if any(self._left)
-                         else 'count(DISTINCT {fields})'.format(fields=self.heading.as_sql(
-                            self.primary_key, include_aliases=False))),
-                from_=self.from_clause(),
-                where=self.where_clause())).fetchone()[0]
+            f'SELECT {select} FROM {self.from_clause()}{self.where_clause()}').fetchone()[0]
 
     def __bool__(self):
         """
@@ -457,9 +478,7 @@ class QueryExpression:
             faster e.g. ``bool(q1)``.
         """
         return bool(self.connection.query(
-            'SELECT EXISTS(SELECT 1 FROM {from_}{where})'.format(
-                from_=self.from_clause(),
-                where=self.where_clause())).fetchone()[0])
+            f'SELECT EXISTS(SELECT 1 FROM {self.from_clause()}{self.where_clause()})').fetchone()[0])
 
     def __contains__(self, item):
         """
@@ -469,45 +488,29 @@ class QueryExpression:
         (item in query_expression) is equivalent to bool(query_expression & item) but may be
         executed more efficiently.
         """
-        return bool(self & item)  # May be optimized e.g. using an EXISTS query
+        return bool(self & item)  # __bool__ issues an EXISTS query
 
     def __iter__(self):
         """
-        returns an iterator-compatible QueryExpression object e.g. ``iter(q1)``.
-
-        :param self: iterator-compatible QueryExpression object
-        """
-        self._iter_only_key = all(v.in_key for v in self.heading.attributes.values())
-        self._iter_keys = self.fetch('KEY')
-        return self
-
-    def __next__(self):
-        """
-        returns the next record on an iterator-compatible QueryExpression object
-            e.g. ``next(q1)``.
+        iterates over the records of the query expression e.g. ``for row in q1``.
+        Each record is returned as a dict.
 
         :param self: A query expression
         :type self: :class:`QueryExpression`
-        :rtype: dict
-        """
-        try:
-            key = self._iter_keys.pop(0)
-        except AttributeError:
-            # self._iter_keys is missing because __iter__ has not been called.
-            raise TypeError("A QueryExpression object is not an iterator. "
-                            "Use iter(obj) to create an iterator.")
-        except IndexError:
-            raise StopIteration
-        else:
-            if self._iter_only_key:
-                return key
-            else:
-                try:
-                    return (self & key).fetch1()
-                except DataJointError:
-                    # The data may have been deleted since the moment the keys were fetched
-                    # -- move on to next entry.
-                    return next(self)
+        """
+        if all(v.in_key for v in self.heading.attributes.values()):
+            yield from self.fetch('KEY')
+            return
+        if not self.primary_key:
+            # without a primary key, the records cannot be fetched by key
+            yield from self.fetch(as_dict=True)
+            return
+        keys = self.fetch('KEY', order_by='KEY')
+        # fetch the records in batches of keys rather than one query per record.
+        # Records deleted since the moment the keys were fetched are skipped.
+        for start in range(0, len(keys), self._iter_batch_size):
+            yield from (self & keys[start:start + self._iter_batch_size]).fetch(
+                as_dict=True, order_by='KEY')
 
     def cursor(self, offset=0, limit=None, order_by=None, as_dict=False):
         """
@@ -553,7 +556,6 @@ class Aggregation(QueryExpression):
     Aggregation is a private class in DataJoint, not exposed to users.
     """
     _left_restrict = None   # the pre-GROUP BY conditions for the WHERE clause
-    _subquery_alias_count = count()
 
     @classmethod
     def create(cls, arg, group, keep_all_rows=False):
@@ -578,27 +580,46 @@ class Aggregation(QueryExpression):
             str(s) for s in self._left_restrict)
 
     def make_sql(self, fields=None):
-        fields = self.heading.as_sql(fields or self.heading.names)
+        if fields is None and self._cached_sql is not None and self._cached_sql[0] is self.heading:
+            return self._cached_sql[1]
         assert self._grouping_attributes or not self.restriction
         distinct = set(self.heading.names) == set(self.primary_key)
-        return 'SELECT {distinct}{fields} FROM {from_}{where}{group_by}'.format(
+        sql = 'SELECT {distinct}{fields} FROM {from_}{where}{group_by}'.format(
             distinct="DISTINCT " if distinct else "",
-            fields=fields,
+            fields=self.heading.as_sql(fields or self.heading.names),
             from_=self.from_clause(),
             where=self.where_clause(),
             group_by="" if not self.primary_key else (
                 " GROUP BY `%s`" % '`,`'.join(self._grouping_attributes) +
                 ("" if not self.restriction else ' HAVING (%s)' % ')AND('.join(self.restriction))))
+        if fields is None:
+            self._cached_sql = self.heading, sql
+        return sql
 
     def __len__(self):
-        return self.connection.query(
-            'SELECT count(1) FROM ({subquery}) `${alias:x}`'.format(
-                subquery=self.make_sql(),
-                alias=next(self._subquery_alias_count))).fetchone()[0]
+        names = set(self.heading.names)
+        if (self.restriction or not self.primary_key or
+                not names.issuperset(self._grouping_attributes) or
+                not set(self.heading.new_attributes).isdisjoint(self._grouping_attributes)):
+            # count the complete aggregation: HAVING may refer to the aggregated attributes and
+            # projections that drop grouping attributes collapse the groups with DISTINCT
+            return self.connection.query(
+                f'SELECT count(1) FROM ({self.make_sql()}) `$sub`'
+            ).fetchone()[0]
+        # count the groups without computing the aggregates
+        fields = '`' + '`,`'.join(self._grouping_attributes) + '`'
+        if (not any(self._left) and all(isinstance(src, str) for src in self.support) and
+                not any(self.heading[name].nullable for name in self._grouping_attributes)):
+            # count(DISTINCT ...) skips NULLs whereas GROUP BY makes NULL a group of its own
+            sql = f'SELECT count(DISTINCT {fields}) FROM {self.from_clause()}{self.where_clause()}'
+        else:
+            sql = (f'SELECT count(1) FROM (SELECT 1 FROM {self.from_clause()}{self.where_clause()} '
+                   f'GROUP BY {fields}) `$sub`')
+        return self.connection.query(sql).fetchone()[0]
 
     def __bool__(self):
         return bool(self.connection.query(
-            'SELECT EXISTS({sql})'.format(sql=self.make_sql())))
+            f'SELECT EXISTS({self.make_sql()})').fetchone()[0])
 
 
 class Union(QueryExpression):
@@ -626,16 +647,28 @@ class Union(QueryExpression):
         result._support = [arg1, arg2]
         return result
 
-    def make_sql(self):
+    def make_sql(self, fields=None):
+        """
+        Make the SQL UNION statement. The union is not wrapped in an outer SELECT.
+        :param fields: used to explicitly set the select attributes, e.g. when used as a restriction
+        """
+        if fields is None and self._cached_sql is not None and self._cached_sql[0] is self.heading:
+            return self._cached_sql[1]
+        sql = self._make_union_sql(fields)
+        if fields is None:
+            self._cached_sql = self.heading, sql
+        return sql
+
+    def _make_union_sql(self, fields=None):
         arg1, arg2 = self._support
         if not arg1.heading.secondary_attributes and not arg2.heading.secondary_attributes:
             # no secondary attributes: use UNION DISTINCT
-            fields = arg1.primary_key
+            fields = fields or arg1.primary_key
             return "({sql1}) UNION ({sql2})".format(
                 sql1=arg1.make_sql(fields),
                 sql2=arg2.make_sql(fields))
         # with secondary attributes, use union of left join with antijoin
-        fields = self.heading.names
+        fields = fields or self.heading.names
         sql1 = arg1.join(arg2, left=True).make_sql(fields)
         sql2 = (arg2 - arg1).proj(
             ..., **{k: 'NULL' for k in arg1.heading.secondary_attributes}).make_sql(fields)
@@ -651,13 +684,12 @@ class Union(QueryExpression):
 
     def __len__(self):
         return self.connection.query(
-            'SELECT count(1) FROM ({subquery}) `${alias:x}`'.format(
-                subquery=self.make_sql(),
-                alias=next(QueryExpression._subquery_alias_count))).fetchone()[0]
+            f'SELECT count(1) FROM ({self.make_sql()}) `$sub`'
+        ).fetchone()[0]
 
     def __bool__(self):
         return bool(self.connection.query(
-            'SELECT EXISTS({sql})'.format(sql=self.make_sql())))
+            f'SELECT EXISTS({self.make_sql()})').fetchone()[0])
 
 
 class U:
@@ -723,7 +755,7 @@ class U:
             other = other()   # instantiate if a class
         if not isinstance(other, QueryExpression):
             raise DataJointError('Set U can only be restricted with a QueryExpression.')
-        result = copy.copy(other)
+        result = other._copy()
         result._distinct = True
         result._heading = result.heading.set_primary_key(self.primary_key)
         result = result.proj()
@@ -742,13 +774,11 @@ class U:
             other = other()   # instantiate if a class
         if not isinstance(other, QueryExpression):
             raise DataJointError('Set U can only be joined with a QueryExpression.')
-        try:
-            raise DataJointError(
-                'Attribute `%s` not found' % next(k for k in self.primary_key
-                                                  if k not in other.heading.names))
-        except StopIteration:
-            pass  # all ok
-        result = copy.copy(other)
+        names = set(other.heading.names)
+        for k in self.primary_key:
+            if k not in names:
+                raise DataJointError('Attribute `%s` not found' % k)
+        result = other._copy()
         result._heading = result.heading.set_primary_key(
             other.primary_key + [k for k in self.primary_key
                                  if k not in other.primary_key])
@@ -12,6 +12,9 @@ from .errors import DataJointError
 from .settings import config
 from .utils import safe_write
 
+key_regexp = re.compile(r'^\s*KEY(\s+[aA][Ss][Cc])?\s*$')
+key_desc_regexp = re.compile(r'^\s*KEY\s+[Dd][Ee][Ss][Cc]\s*$')
+
 
 class key:
     """
@@ -31,6 +34,11 @@ def to_dicts(recarray):
         yield dict(zip(recarray.dtype.names, rec.tolist()))
 
 
+def _no_adapter(value):
+    """ shared pass-through used by _get for attributes without an adapter """
+    return value
+
+
 def _get(connection, attr, data, squeeze, download_path):
     """
     This function is called for every attribute
@@ -48,7 +56,7 @@ def _get(connection, attr, data, squeeze, download_path):
     extern = connection.schemas[attr.database].external[attr.store] if attr.is_external else None
 
     # apply attribute adapter if present
-    adapt = attr.adapter.get if attr.adapter else lambda x: x
+    adapt = attr.adapter.get if attr.adapter else _no_adapter
 
     if attr.is_filepath:
         return adapt(extern.download_filepath(uuid.UUID(bytes=data))[0])
@@ -88,6 +96,15 @@ def _get(connection, attr, data, squeeze, download_path):
             if attr.is_blob else data))
 
 
+def _requires_unpacking(attr):
+    """
+    :param attr: attribute from the table's heading
+    :return: False if the fetched values of attr are returned as is, so that _get can be skipped
+    """
+    return bool(attr.is_blob or attr.is_attachment or attr.is_filepath or attr.is_external
+                or attr.uuid or attr.adapter)
+
+
 def _flatten_attribute_list(primary_key, attrs):
     """
     :param primary_key: list of attributes in primary key
@@ -95,9 +112,9 @@ def _flatten_attribute_list(primary_key, attrs):
     :return: generator of attributes where "KEY" is replaces with its component attributes
     """
     for a in attrs:
-        if re.match(r'^\s*KEY(\s+[aA][Ss][Cc])?\s*$', a):
+        if key_regexp.match(a):
             yield from primary_key
-        elif re.match(r'^\s*KEY\s+[Dd][Ee][Ss][Cc]\s*$', a):
+        elif key_desc_regexp.match(a):
             yield from (q + ' DESC' for q in primary_key)
         else:
             yield a
@@ -181,7 +198,9 @@ class Fetch:
                 as_dict=False, squeeze=squeeze, download_path=download_path,
                 format='array')
             if attrs_as_dict:
-                ret = [{k: v for k, v in zip(ret.dtype.names, x) if k in attrs} for x in ret]
+                # map the requested names to field ordinals once rather than for every row
+                fields = [(i, k) for i, k in enumerate(ret.dtype.names) if k in attrs]
+                ret = [{k: x[i] for i, k in fields} for x in ret]
             else:
                 return_values = [list(
                     (to_dicts if as_dict else lambda x: x)(ret[self._expression.primary_key]))
@@ -192,23 +211,29 @@ class Fetch:
             cur = self._expression.cursor(
                 as_dict=as_dict, limit=limit, offset=offset, order_by=order_by)
             heading = self._expression.heading
+            # compile the row layout once per result set: a decoder for each attribute
+            # or None for attributes whose values are used as fetched
+            layout = [(name, partial(get, heading[name]) if _requires_unpacking(heading[name]) else None)
+                      for name in heading.names]
             if as_dict:
-                ret = [dict((name, get(heading[name], d[name]))
-                            for name in heading.names) for d in cur]
+                ret = [dict((name, d[name] if decode is None else decode(d[name]))
+                            for name, decode in layout) for d in cur]
             else:
                 ret = list(cur.fetchall())
-                record_type = (heading.as_dtype if not ret else np.dtype(
+                dtype = heading.as_dtype  # computed once: as_dtype rebuilds the dtype on each access
+                record_type = (dtype if not ret else np.dtype(
                     [(name, type(value))   # use the first element to determine blob type
                         if heading[name].is_blob and isinstance(value, numbers.Number)
-                        else (name, heading.as_dtype[name])
-                        for value, name in zip(ret[0], heading.as_dtype.names)]))
+                        else (name, dtype[name])
+                        for value, name in zip(ret[0], dtype.names)]))
                 try:
                     ret = np.array(ret, dtype=record_type)
                 except Exception as e:
                     raise e
-                for name in heading:
-                    # unpack blobs and externals
-                    ret[name] = list(map(partial(get, heading[name]), ret[name]))
+                for name, decode in layout:
+                    if decode is not None:
+                        # unpack blobs and externals
+                        ret[name] = list(map(decode, ret[name]))
                 if format == "frame":
                     ret = pandas.DataFrame(ret).set_index(heading.primary_key)
         return ret
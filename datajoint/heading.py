@@ -21,6 +21,8 @@ class Attribute(namedtuple('_Attribute', default_attribute_properties)):
     """
     Properties of a table column (attribute)
     """
+    __slots__ = ()  # no per-instance __dict__: headings create many attributes
+
     def todict(self):
         """Convert namedtuple to dict."""
         return dict((name, self[i]) for i, name in enumerate(self._fields))
@@ -71,6 +73,8 @@ class Heading:
         self._table_status = None
         self._attributes = None if attribute_specs is None else dict(
             (q['name'], Attribute(**q)) for q in attribute_specs)
+        self._selections = {}  # memoized results of select()
+        self._name_lists = {}  # memoized lists of attribute names, computed once the attributes are known
 
     def __len__(self):
         return 0 if self.attributes is None else len(self.attributes)
@@ -89,17 +93,28 @@ class Heading:
             self._init_from_database()   # lazy loading from database
         return self._attributes
 
+    def _names_where(self, kind, condition):
+        """
+        :return: the memoized list of attribute names whose attributes satisfy condition.
+        The lists are shared and must not be modified by the caller.
+        """
+        try:
+            return self._name_lists[kind]
+        except KeyError:
+            names = self._name_lists[kind] = [k for k, v in self.attributes.items() if condition(v)]
+            return names
+
     @property
     def names(self):
-        return [k for k in self.attributes]
+        return self._names_where('names', lambda v: True)
 
     @property
     def primary_key(self):
-        return [k for k, v in self.attributes.items() if v.in_key]
+        return self._names_where('primary_key', lambda v: v.in_key)
 
     @property
     def secondary_attributes(self):
-        return [k for k, v in self.attributes.items() if not v.in_key]
+        return self._names_where('secondary_attributes', lambda v: not v.in_key)
 
     @property
     def blobs(self):
@@ -111,7 +126,7 @@ class Heading:
 
     @property
     def new_attributes(self):
-        return [k for k, v in self.attributes.items() if v.attribute_expression is not None]
+        return self._names_where('new_attributes', lambda v: v.attribute_expression is not None)
 
     def __getitem__(self, name):
         """shortcut to the attribute"""
@@ -151,9 +166,10 @@ class Heading:
         """
         represent heading as the SQL SELECT clause.
         """
+        attributes = self.attributes  # resolve the lazy property once rather than per field
         return ','.join(
-            '`%s`' % name if self.attributes[name].attribute_expression is None
-            else self.attributes[name].attribute_expression + (' as `%s`' % name if include_aliases else '')
+            '`%s`' % name if attributes[name].attribute_expression is None
+            else attributes[name].attribute_expression + (' as `%s`' % name if include_aliases else '')
             for name in fields)
 
     def __iter__(self):
@@ -326,19 +342,31 @@ class Heading:
         :param rename_map:  dictionary of renamed attributes: keys=new names, values=old names
         :param compute_map: a direction of computed attributes
         This low-level method performs no error checking.
+        Headings are not modified once created, so the same selection returns the same heading.
         """
         rename_map = rename_map or {}
         compute_map = compute_map or {}
+        selection = (frozenset(select_list), tuple(rename_map.items()), tuple(compute_map.items()))
+        try:
+            return self._selections[selection]
+        except KeyError:
+            pass
+        new_names = defaultdict(list)
+        for new_name, old_name in rename_map.items():
+            new_names[old_name].append(new_name)
         copy_attrs = list()
-        for name in self.attributes:
-            if name in select_list:
-                copy_attrs.append(self.attributes[name].todict())
+        for name, attr in self.attributes.items():
+            if name in selection[0]:
+                copy_attrs.append(attr.todict())
             copy_attrs.extend((
-                dict(self.attributes[old_name].todict(), name=new_name, attribute_expression='`%s`' % old_name)
-                for new_name, old_name in rename_map.items() if old_name == name))
+                dict(attr.todict(), name=new_name, attribute_expression='`%s`' % name)
+                for new_name in new_names.get(name, ())))
         compute_attrs = (dict(default_attribute_properties, name=new_name, attribute_expression=expr)
                          for new_name, expr in compute_map.items())
-        return Heading(chain(copy_attrs, compute_attrs))
+        heading = Heading(chain(copy_attrs, compute_attrs))
+        if len(self._selections) < 256:  # bound the memory held by long-lived table headings
+            self._selections[selection] = heading
+        return heading
 
     def join(self, other):
         """
@@ -16,8 +16,7 @@ GLOBALCONFIG = '.datajoint_config.json'
 # 2, 2 means that file abcdef is stored as /ab/cd/abcdef
 DEFAULT_SUBFOLDING = (2, 2)
 
-validators = collections.defaultdict(lambda: lambda value: True)
-validators['database.port'] = lambda a: isinstance(a, int)
+validators = {'database.port': lambda a: isinstance(a, int)}
 
 Role = Enum('Role', 'manual lookup imported computed job')
 role_to_prefix = {
@@ -195,6 +194,7 @@ class Config(collections.MutableMapping):
         The default parameters are stored in datajoint.settings.default . If a local config file
         exists, the settings specified in this file override the default settings.
         """
+        __slots__ = ('_conf',)
 
         def __init__(self, *args, **kwargs):
             self._conf = dict(default)
@@ -204,8 +204,9 @@ class Config(collections.MutableMapping):
             return self._conf[key]
 
         def __setitem__(self, key, value):
-            logger.log(logging.INFO, u"Setting {0:s} to {1:s}".format(str(key), str(value)))
-            if validators[key](value):
+            logger.info("Setting %s to %s", key, value)
+            validate = validators.get(key)
+            if validate is None or validate(value):  # keys without a validator accept any value
                 self._conf[key] = value
             else:
                 raise DataJointError(u'Validator for {0:s} did not pass'.format(key))
@@ -128,3 +128,42 @@ def test_union_join():
                      {'id': 200, 'id2': 22}, {'id': 400, 'id2': 44}]
 
     assert ((q1 + q2) * A).fetch(as_dict=True) == expected_data
+
+
+def test_aggr_union_bool():
+    assert not (A & 'id=-1').aggr(B, n='count(*)')
+    assert not (B & 'id=-1') + (B & 'id=-2')
+    assert A.aggr(B, n='count(*)')
+    assert (B & 'id < 300') + (B & 'id > 300')
+
+
+@schema
+class NullableVal(dj.Lookup):
+    definition = """
+    id: int
+    ---
+    val = null : int
+    """
+    contents = [(0, None), (1, None), (2, 1), (3, 1), (4, 2)]
+
+
+def test_aggr_len():
+    for q in (A.aggr(B, n='count(*)'),
+              A.aggr(B, n='count(id2)', keep_all_rows=True),
+              (A & 'id > 2').aggr(B & 'id2 > 6', n='count(*)'),
+              (A * X).aggr(B, n='count(*)'),
+              A.proj(x='id').aggr(B.proj(x='id'), n='count(*)', keep_all_rows=True),
+              A.aggr(B, n='count(*)') & 'n > 0',
+              dj.U('val').aggr(NullableVal, n='count(*)'),
+              (dj.U('val') & NullableVal).aggr(NullableVal, n='count(*)'),
+              dj.U('n') & A.aggr(B, n='count(*)')):
+        assert_equal(len(q), len(q.fetch()))
+    # NULL forms a group of its own
+    assert_equal(len(dj.U('val').aggr(NullableVal, n='count(*)')), 3)
+
+
+def test_join_union():
+    # union as the right operand of a join
+    q = (B & 'id < 3') + (B & 'id > 3')
+    assert_equal(len(A * q), len(q))
+    assert_equal((A * q).fetch(as_dict=True, order_by='KEY'), (q * A).fetch(as_dict=True, order_by='KEY'))
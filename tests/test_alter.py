@@ -1,4 +1,4 @@
-from nose.tools import assert_equal, assert_not_equal
+from nose.tools import assert_equal, assert_not_equal, assert_true
 from .schema import *
 
 
@@ -30,10 +30,14 @@ class Experiment(dj.Imported):
 
 def test_alter():
     original = schema.connection.query("SHOW CREATE TABLE " + Experiment.full_table_name).fetchone()[1]
+    held = Experiment()
+    assert_true('`extra`' not in held.make_sql())
     Experiment.definition = Experiment.definition1
     Experiment.alter(prompt=False)
     altered = schema.connection.query("SHOW CREATE TABLE " + Experiment.full_table_name).fetchone()[1]
     assert_not_equal(original, altered)
+    # other instances of the table must not keep the SQL of the old heading
+    assert_true('`extra`' in held.make_sql())
     Experiment.definition = Experiment.original_definition
     Experiment().alter(prompt=False)
     restored = schema.connection.query("SHOW CREATE TABLE " + Experiment.full_table_name).fetchone()[1]
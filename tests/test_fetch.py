@@ -120,6 +120,12 @@ class TestFetch:
         for row, (tname, tlang) in list(zip(cur, languages)):
             assert_true(row['name'] == tname and row['language'] == tlang, 'Values are not the same')
 
+    def test_iter_batches(self):
+        """Test that iteration over several batches returns every record once"""
+        subject = schema.Subject()
+        subject._iter_batch_size = 2
+        assert_list_equal(list(subject), subject.fetch(as_dict=True, order_by='KEY'))
+
     def test_keys(self):
         """test key fetch"""
         languages = schema.Language.contents
@@ -72,6 +72,11 @@ class TestU:
         assert_equal(len(rel), len(set(l[1] for l in schema.Language.contents)))
         assert_equal((rel & 'language="English"').fetch1('number_of_speakers'), 3)
 
+    @staticmethod
+    def test_iter_without_primary_key():
+        rows = list(dj.U().aggr(schema.Language, n='count(*)'))
+        assert_list_equal(rows, [dict(n=len(schema.Language()))])
+
     def test_argmax(self):
         rel = schema.TTest()
         # get the tuples corresponding to maximum value
@@ -47,6 +47,43 @@ class TestRelational:
         r = 'n>5'
         assert_equal((B() & r).make_sql(), (free & r).make_sql())
 
+    @staticmethod
+    def test_make_sql_cache():
+        x = B() & 'id_a=1'
+        sql = x.make_sql()
+        assert_equal(sql, x.make_sql())
+        y = x & 'id_b=1'
+        assert_true(y.make_sql() != sql, 'derived expression reused the cached SQL')
+        assert_equal(x.make_sql(), sql, 'restriction modified original')
+        x.restrict_in_place('id_b=1')
+        assert_equal(x.make_sql(), y.make_sql())
+        assert_equal(len(x), len(y))
+
+    @staticmethod
+    def test_ineffective_restrictions():
+        rel = B()
+        for restriction in (True, dj.AndList()):
+            assert_true((rel & restriction) is rel)
+        for restriction in (False, []):
+            assert_true((rel - restriction) is rel)
+        assert_equal(len(rel - dj.AndList()), 0)
+
+    @staticmethod
+    def test_from_clause_cache():
+        x = B.aggr(B.C(), n='count(*)').make_subquery() & 'n > 0'
+        assert_equal(x.from_clause(), x.from_clause())
+        assert_equal(x.make_sql(['n']), x.make_sql(['n']))
+        # aliases do not depend on how many queries were built before
+        assert_equal(x.make_sql(),
+                     (B.aggr(B.C(), n='count(*)').make_subquery() & 'n > 0').make_sql())
+
+    @staticmethod
+    def test_heading_selection_cache():
+        x = A.proj(i='id_a', c='cond_in_a', d='(cond_in_a)', e='cond_in_a + 1')
+        assert_true(x.heading is A.proj(i='id_a', c='cond_in_a', d='(cond_in_a)', e='cond_in_a + 1').heading)
+        assert_list_equal(x.heading.names, ['i', 'c', 'd', 'e'])
+        assert_true(x.heading is not A.proj(i='id_a', c='cond_in_a').heading)
+
     @staticmethod
     def test_rename():
         # test renaming
@@ -64,6 +101,11 @@ class TestRelational:
         assert_equal(len(z), len(B() & 'id_a in (3,4)'),
                      'incorrect nested subqueries')
 
+    @staticmethod
+    @raises(dj.DataJointError)
+    def test_rename_missing_attribute():
+        A.proj(a='not_an_attribute')
+
     @staticmethod
     def test_rename_order():
         """
@@ -186,6 +228,11 @@ class TestRelational:
         assert_set_equal(x.union(y), z)
         assert_equal(len(IJ + JI), len(z))
 
+    @staticmethod
+    def test_union_restriction():
+        assert_equal(len(IJ & (IJ + JI)), len(IJ))
+        assert_false(IJ - (IJ + JI))
+
     @staticmethod
     @raises(dj.DataJointError)
     def test_outer_union_fail():